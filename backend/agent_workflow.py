@@ -1,7 +1,10 @@
 import json
 import os
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 
+import orjson
+
 from .tools import tool_find_activities
 
 try:
@@ -16,18 +19,24 @@ if genai and _GEMINI_KEY:
     genai.configure(api_key=_GEMINI_KEY)
 
 
-def _collect_keywords(prompt: str, friends: Dict[str, Any]) -> List[str]:
+def _friend_likes(friends: Dict[str, Any]) -> Tuple[str, ...]:
+    likes_flat: List[str] = []
+    for profile in friends.values():
+        if isinstance(profile, dict):
+            likes = profile.get("likes")
+            if isinstance(likes, list):
+                likes_flat.extend(str(item) for item in likes if item)
+    return tuple(likes_flat)
+
+
+@lru_cache(maxsize=512)
+def _collect_keywords_cached(prompt: str, friend_likes: Tuple[str, ...]) -> Tuple[str, ...]:
     keywords: List[str] = []
     for part in prompt.replace("•", ",").split(","):
         slot = part.strip()
         if slot:
             keywords.append(slot)
-
-    for profile in friends.values():
-        if isinstance(profile, dict):
-            likes = profile.get("likes")
-            if isinstance(likes, list):
-                keywords.extend(str(item) for item in likes if item)
+    keywords.extend(friend_likes)
 
     seen = set()
     unique: List[str] = []
@@ -36,14 +45,30 @@ def _collect_keywords(prompt: str, friends: Dict[str, Any]) -> List[str]:
         if token not in seen:
             seen.add(token)
             unique.append(kw)
-    return unique[:12]
+    return tuple(unique[:12])
+
+
+def _collect_keywords(prompt: str, friends: Dict[str, Any]) -> List[str]:
+    # Keyword extraction only depends on the prompt and the friends' likes, so
+    # the work is memoised on that hashable view of the inputs.
+    return list(_collect_keywords_cached(prompt, _friend_likes(friends)))
+
+
+def _dump_friends(friends: Dict[str, Any]) -> str:
+    # orjson is the fast path. It writes non-ASCII as raw UTF-8 rather than
+    # \u escapes, which the model reads just as well. It rejects some input
+    # json.dumps accepts (ints beyond 64 bits, non-str keys), so fall back there.
+    try:
+        return orjson.dumps(friends, option=orjson.OPT_INDENT_2).decode()
+    except (TypeError, orjson.JSONEncodeError):
+        return json.dumps(friends, indent=2)
 
 
 def _call_gemini(prompt: str, friends: Dict[str, Any]) -> Tuple[str, List[str]]:
     if not (genai and _GEMINI_KEY):
         raise RuntimeError("Gemini API key not configured")
 
-    friend_context = json.dumps(friends, indent=2)
+    friend_context = _dump_friends(friends)
     instructions = (
         "You are Challo, an AI concierge planning group activities. "
         "Given a natural language prompt and friend profiles, reply with JSON like "
@@ -73,14 +98,14 @@ def _call_gemini(prompt: str, friends: Dict[str, Any]) -> Tuple[str, List[str]]:
         text = "\n".join(all_parts)
 
     try:
-        data = json.loads(text)
-    except json.JSONDecodeError as exc:
+        data = orjson.loads(text)
+    except orjson.JSONDecodeError as exc:
         raise RuntimeError(f"Gemini returned non-JSON content: {text}") from exc
     summary = str(data.get("summary") or "")
     keywords = data.get("keywords") or []
     if isinstance(keywords, str):
         keywords = [keywords]
-    keywords = [str(item) for item in keywords if item]
+    keywords = [item if isinstance(item, str) else str(item) for item in keywords if item]
     return summary, keywords
 
 
@@ -94,7 +119,7 @@ def agent_discover(prompt: str, location: str | None, budget_cap: float | None,
     if not keywords:
         keywords = _collect_keywords(prompt, friends)
 
-    friend_summary = json.dumps(friends, indent=2)
+    friend_summary = _dump_friends(friends)
     if not summary:
         summary = (
             "Blending your crew’s favorites:\n"
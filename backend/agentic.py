@@ -1,25 +1,35 @@
 from typing import Any, Dict, List, Optional, Tuple
 import os
 
-from .schemas import GroupRequest, PlanResponse, PlanCard
+import orjson
+from pydantic import ValidationError
+
+from .schemas import ControllerDecision, GroupRequest, PlanResponse, PlanCard, UserTaste
 from .agents import ListenerAgent, WriterAgent, llm_json
 from .tools import (
-    tool_get_user_taste,
+    tool_get_user_tastes,
     tool_merge_tastes,
     tool_find_activities,
-    tool_get_user_taste_cached,
     tool_search_places_grid,
     tool_sentiment_enrich,
     tool_calendar_probe,
     tool_reserve_table,
+    _PROFILE_TTL,
 )
+from .llm_cache import normalise_state
+from .plan_cache import PlanCache, mark_degraded
 from .prompts import SYSTEM_CONTROLLER
 
 
 class AgenticController:
-    def __init__(self) -> None:
-        self.listener = ListenerAgent()
-        self.writer = WriterAgent()
+    def __init__(
+        self,
+        listener: Optional[ListenerAgent] = None,
+        writer: Optional[WriterAgent] = None,
+    ) -> None:
+        # Agents are stateless, so callers may share instances across requests.
+        self.listener = listener or ListenerAgent()
+        self.writer = writer or WriterAgent()
 
     def _apply_request_overrides(
         self,
@@ -66,19 +76,90 @@ class AgenticController:
 
         return merged
 
-    def _decide(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    def _decide(self, state: Dict[str, Any]) -> ControllerDecision:
         # Ask LLM controller which tool to call next
         prompt = {
             "query": state.get("query"),
             "listener": state.get("listener"),
-            "tastes": [t.model_dump() if hasattr(t, "model_dump") else dict(t) for t in state.get("tastes", [])],
+            # Unset profile fields carry no signal for the controller; leaving
+            # them out shrinks the prompt and the serialisation work.
+            "tastes": [
+                t.model_dump(mode="json", exclude_none=True) if hasattr(t, "model_dump") else dict(t)
+                for t in state.get("tastes", [])
+            ],
             "merged": state.get("merged"),
             "observations": state.get("observations", []),
         }
-        return llm_json(
-            prompt=str(prompt),
+        # Serialise deterministically so identical states map to the same
+        # LLM cache entry (str() of a dict is neither stable nor valid JSON).
+        prompt_bytes = orjson.dumps(prompt, option=orjson.OPT_SORT_KEYS, default=str)
+        raw = llm_json(
+            prompt=prompt_bytes.decode(),
             system=SYSTEM_CONTROLLER,
-        ) or {}
+            cache_key=normalise_state(prompt),
+        )
+        if not raw:
+            return ControllerDecision()
+        try:
+            return ControllerDecision.model_validate(raw)
+        except ValidationError:
+            # Malformed controller output is treated like a disabled LLM.
+            return ControllerDecision()
+
+    @staticmethod
+    def _is_trivial(req: GroupRequest, listener_out: Dict[str, Any]) -> bool:
+        if not os.getenv("GEMINI_API_KEY"):
+            # Without an LLM the controller returns no action on its first
+            # step and takes the fallback anyway.
+            return True
+        # Otherwise only requests with nothing for the controller to weigh:
+        # a small group, a clear listener vibe and no explicit constraints.
+        return (
+            len(req.user_ids) <= 3
+            and not req.time_window
+            and not req.custom_likes
+            and not req.custom_tags
+            and req.vibe_hint is None
+            and req.budget_cap is None
+            and req.distance_km is None
+            and bool(listener_out.get("primary_vibes"))
+        )
+
+    def _ensure_tastes(self, state: Dict[str, Any]) -> List[UserTaste]:
+        if not state["tastes"]:
+            state["tastes"] = tool_get_user_tastes(state["user_ids"])
+        return state["tastes"]
+
+    def _ensure_merged(
+        self,
+        state: Dict[str, Any],
+        controller_overrides: Optional[Dict[str, Any]] = None,
+        refresh: bool = False,
+    ) -> Dict[str, Any]:
+        # Tastes and the merge are memoised in state, so however the
+        # controller orders its actions they are fetched and built once.
+        if state.get("merged") and not refresh:
+            return state["merged"]
+        merged = tool_merge_tastes(self._ensure_tastes(state))
+        merged = self._apply_request_overrides(merged, state, controller_overrides)
+        state["merged"] = merged
+        return merged
+
+    def _fallback_plan(self, state: Dict[str, Any], action_log: List[str]) -> PlanResponse:
+        # Fallback: get tastes → merge → search → write
+        merged = self._ensure_merged(state)
+        raw = tool_find_activities(merged)
+        cards = self.writer.run({"merged": merged, "raw_candidates": raw})
+        return PlanResponse.model_construct(
+            query_normalized=state["query"],
+            merged_vibe=merged.get("vibe", "chill"),
+            energy_profile=merged.get("energy_level", "medium"),
+            candidates=cards,
+            action_log=action_log + [
+                "Planner: merged tastes & fetched activities (fallback)",
+                f"Writer: scored {len(cards)} candidates",
+            ],
+        )
 
     def run(self, req: GroupRequest) -> PlanResponse:
         action_log: List[str] = []
@@ -104,39 +185,35 @@ class AgenticController:
             "vibe_hint": req.vibe_hint,
         }
 
-        # Default deterministic path if controller cannot produce actions
-        default_plan: Optional[PlanResponse] = None
+        if self._is_trivial(req, listener_out):
+            # Take the deterministic path without controller round-trips. With
+            # a live LLM this forgoes grid search/enrichment, so _is_trivial
+            # only admits unconstrained small-group requests.
+            return self._fallback_plan(state, action_log)
 
+        seen_actions: set[Tuple[str, bytes]] = set()
         for step in range(1, 8):
             decision = self._decide(state)
-            action = decision.get("action")
-            args = decision.get("args") or {}
-            rationale = decision.get("rationale") or ""
+            action = decision.action
+            args = decision.args
 
             if not action:
-                # Build a default path once; if LLM is disabled or fails
-                if default_plan is None:
-                    # Fallback: get tastes → merge → search → write
-                    tastes = [tool_get_user_taste(uid) for uid in req.user_ids]
-                    merged = tool_merge_tastes(tastes)
-                    merged = self._apply_request_overrides(merged, state)
-                    raw = tool_find_activities(merged)
-                    cards = self.writer.run({"merged": merged, "raw_candidates": raw})
-                    default_plan = PlanResponse(
-                        query_normalized=state["query"],
-                        merged_vibe=merged.get("vibe", "chill"),
-                        energy_profile=merged.get("energy_level", "medium"),
-                        candidates=cards,
-                        action_log=action_log + [
-                            "Planner: merged tastes & fetched activities (fallback)",
-                            f"Writer: scored {len(cards)} candidates",
-                        ],
-                    )
-                return default_plan
+                # LLM is disabled or failed: take the default path.  With a key
+                # set this is an outage or malformed output, not a real plan.
+                if os.getenv("GEMINI_API_KEY"):
+                    mark_degraded()
+                return self._fallback_plan(state, action_log)
+
+            # A repeated (action, args) pair cannot make progress; stop paying
+            # for further decisions and finalize with what we have.
+            signature = (action, orjson.dumps(args, option=orjson.OPT_SORT_KEYS, default=str))
+            if signature in seen_actions:
+                break
+            seen_actions.add(signature)
 
             if action == "get_tastes":
                 user_ids = args.get("user_ids") or state["user_ids"]
-                tastes = [tool_get_user_taste_cached(uid) for uid in user_ids]
+                tastes = tool_get_user_tastes(user_ids)
                 state["tastes"] = tastes
                 obs = f"Fetched tastes for {len(tastes)} users"
                 state["observations"].append(obs)
@@ -144,26 +221,15 @@ class AgenticController:
                 continue
 
             if action == "merge_tastes":
-                if not state["tastes"]:
-                    # Ensure precondition
-                    tastes = [tool_get_user_taste(uid) for uid in state["user_ids"]]
-                    state["tastes"] = tastes
-                merged = tool_merge_tastes(state["tastes"])
                 overrides = (args.get("overrides") or {})
-                merged = self._apply_request_overrides(merged, state, overrides)
-                state["merged"] = merged
+                merged = self._ensure_merged(state, overrides, refresh=True)
                 obs = f"Merged tastes → vibe={merged.get('vibe')} budget_cap={merged.get('budget_cap')}"
                 state["observations"].append(obs)
                 action_log.append("Controller:merge_tastes")
                 continue
 
             if action == "find_activities":
-                if not state.get("merged"):
-                    # Merge if not done
-                    merged = tool_merge_tastes(state["tastes"])
-                    merged = self._apply_request_overrides(merged, state)
-                    state["merged"] = merged
-                raw = tool_find_activities(state["merged"])
+                raw = tool_find_activities(self._ensure_merged(state))
                 state["raw_candidates"] = raw
                 obs = f"Found {len(raw)} activities"
                 state["observations"].append(obs)
@@ -171,15 +237,7 @@ class AgenticController:
                 continue
 
             if action == "search_places_grid":
-                merged = state.get("merged")
-                if not merged:
-                    # ensure merged exists
-                    if not state["tastes"]:
-                        state["tastes"] = [tool_get_user_taste_cached(uid) for uid in state["user_ids"]]
-                    merged = tool_merge_tastes(state["tastes"])
-                merged = self._apply_request_overrides(merged, state)
-                state["merged"] = merged
-                grid = tool_search_places_grid(merged)
+                grid = tool_search_places_grid(self._ensure_merged(state))
                 # prefer union with prior candidates
                 prev = state.get("raw_candidates") or []
                 state["raw_candidates"] = (prev or []) + grid
@@ -217,7 +275,7 @@ class AgenticController:
                 p_out = {"merged": merged, "raw_candidates": state.get("raw_candidates", [])}
                 cards = self.writer.run(p_out)
                 action_log.append(f"Writer: scored {len(cards)} candidates")
-                return PlanResponse(
+                return PlanResponse.model_construct(
                     query_normalized=state["query"],
                     merged_vibe=merged.get("vibe", "chill"),
                     energy_profile=merged.get("energy_level", "medium"),
@@ -233,7 +291,7 @@ class AgenticController:
         p_out = {"merged": merged, "raw_candidates": state.get("raw_candidates", [])}
         cards = self.writer.run(p_out)
         action_log.append(f"Writer: scored {len(cards)} candidates (loop-exit)")
-        return PlanResponse(
+        return PlanResponse.model_construct(
             query_normalized=state["query"],
             merged_vibe=merged.get("vibe", "chill") if merged else "chill",
             energy_profile=merged.get("energy_level", "medium") if merged else "medium",
@@ -242,7 +300,15 @@ class AgenticController:
         )
 
 
+# run() keeps all per-request state in locals, so one controller serves every request.
+_controller = AgenticController()
+
+# Whole-plan cache for hot queries; a hit skips the listener, every
+# controller step and all tool I/O.
+_PLAN_CACHE = PlanCache(maxsize=512, ttl=_PROFILE_TTL)
+
+
 def agentic_plan(req: GroupRequest) -> PlanResponse:
-    return AgenticController().run(req)
+    return _PLAN_CACHE.get_or_build(req, _controller.run)
 
 
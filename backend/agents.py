@@ -1,46 +1,71 @@
 # backend/agents.py
-import json
 import os
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
+import orjson
 from pydantic import ValidationError  # type: ignore
 
+from .llm_cache import llm_cache
+from .plan_cache import mark_degraded
 from .prompts import SYSTEM_LISTENER, SYSTEM_PLANNER, SYSTEM_WRITER
 from .schemas import UserTaste, PlanCard, FriendOverride
-from .tools import tool_get_user_taste, tool_merge_tastes, tool_find_activities
-
-
-def llm_json(prompt: str, system: str) -> Dict[str, Any]:
+from .tools import tool_get_user_tastes, tool_merge_tastes, tool_find_activities
+
+
+@lru_cache(maxsize=16)
+def _gemini_model(api_key: str, model_name: str, system: str) -> Any:
+    import google.generativeai as genai  # type: ignore
+
+    genai.configure(api_key=api_key)
+    # The system prompt rides as system_instruction ahead of the per-request
+    # turn, so every call shares a byte-identical prefix the provider can
+    # serve from its prompt cache, and the model object is built only once.
+    return genai.GenerativeModel(model_name, system_instruction=system.strip())
+
+
+def _gemini_json(prompt: str, system: str, api_key: str) -> Optional[Dict[str, Any]]:
+    try:
+        model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+        model = _gemini_model(api_key, model_name, system)
+        response = model.generate_content(
+            [
+                {
+                    "role": "user",
+                    "parts": [
+                        f"User request:\n{prompt.strip()}\n\nRespond with compact JSON only."
+                    ],
+                }
+            ],
+            generation_config={
+                "temperature": 0.1,
+                "response_mime_type": "application/json",
+            },
+        )
+        text = getattr(response, "text", None)
+        if not text and response.candidates:
+            text = "".join(part.text or "" for part in response.candidates[0].content.parts)
+        if text:
+            return orjson.loads(text)
+    except Exception:
+        # Fall back to deterministic mock response if Gemini fails.
+        pass
+    return None
+
+
+def llm_json(prompt: str, system: str, cache_key: Optional[str] = None) -> Dict[str, Any]:
     api_key = os.getenv("GEMINI_API_KEY")
     if api_key:
-        try:
-            import google.generativeai as genai  # type: ignore
-
-            genai.configure(api_key=api_key)
-            model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
-            model = genai.GenerativeModel(model_name)
-            response = model.generate_content(
-                [
-                    {
-                        "role": "user",
-                        "parts": [
-                            f"{system.strip()}\n\nUser request:\n{prompt.strip()}\n\nRespond with compact JSON only."
-                        ],
-                    }
-                ],
-                generation_config={
-                    "temperature": 0.1,
-                    "response_mime_type": "application/json",
-                },
-            )
-            text = getattr(response, "text", None)
-            if not text and response.candidates:
-                text = "".join(part.text or "" for part in response.candidates[0].content.parts)
-            if text:
-                return json.loads(text)
-        except Exception:
-            # Fall back to deterministic mock response if Gemini fails.
-            pass
+        # Callers with structured prompts pass a normalised signature so
+        # near-duplicate requests share a cache entry. Concurrent identical
+        # requests wait on the one call already in flight.
+        key_text = cache_key if cache_key is not None else prompt
+        result = llm_cache.get_or_compute(
+            system, key_text, lambda: _gemini_json(prompt, system, api_key)
+        )
+        if result is not None:
+            return result
+        mark_degraded()
 
     # Mock fallback for local development without Gemini access.
     if system == SYSTEM_LISTENER:
@@ -69,6 +94,15 @@ class PlannerAgent:
         time_window: Optional[str],
         request_overrides: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
+        tastes = self.prefetch(user_ids, request_overrides)
+        return self.merge(tastes, listener_out, location_hint, time_window, request_overrides)
+
+    def prefetch(
+        self,
+        user_ids: List[str],
+        request_overrides: Optional[Dict[str, Any]] = None,
+    ) -> List[UserTaste]:
+        """Taste lookups need nothing from the listener, so they can overlap it."""
         overrides = request_overrides or {}
 
         friend_override_map: Dict[str, FriendOverride] = {}
@@ -81,7 +115,17 @@ class PlannerAgent:
 
         # 1) fetch tastes (respect overrides when provided)
         overrides_arg = friend_override_map or None
-        tastes = [tool_get_user_taste(uid, overrides=overrides_arg) for uid in user_ids]
+        return tool_get_user_tastes(user_ids, overrides=overrides_arg)
+
+    def merge(
+        self,
+        tastes: List[UserTaste],
+        listener_out: Dict[str, Any],
+        location_hint: str,
+        time_window: Optional[str],
+        request_overrides: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        overrides = request_overrides or {}
 
         # 2) merge constraints and preferences
         merged = tool_merge_tastes(tastes)
@@ -1,19 +1,58 @@
-from typing import Any, Dict, List
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from .mock_events import search_mock_events
+from .llm_cache import llm_cache
+from .mock_events import search_mock_events, warmup as warmup_mock_events
 from .schemas import (
     ActivitySearchRequest,
     AgentDiscoverRequest,
     AgentDiscoverResponse,
     EventItem,
 )
-from .tools import tool_find_activities
+from .tools import close_http_client, tool_find_activities
 from .agent_workflow import agent_discover
 
-app = FastAPI(title="Vivi Planner API", version="0.1.0")
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=2048)
+def _extract_terms(text: str) -> Tuple[str, ...]:
+    # UIs resend identical queries as filters toggle, so tokenisation is cached.
+    terms: List[str] = []
+    seen: set[str] = set()
+    for chunk in text.replace("•", ",").split(","):
+        for word in chunk.strip().split():
+            token = "".join(ch for ch in word.lower() if ch.isalnum())
+            if len(token) < 3:
+                continue
+            if token not in seen:
+                seen.add(token)
+                terms.append(token)
+    return tuple(terms)
+
+
+def _mk_id(it: Dict[str, Any]) -> str:
+    # Built-in hash() is salted per process, so ids would differ between
+    # workers and restarts; blake2b gives a stable id for the same listing.
+    base = f"{it.get('source','src')}::{it.get('title','')}::{it.get('address','')}"
+    return hashlib.blake2b(base.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# EventItem's field names, resolved once so row normalisation is a single
+# comprehension over pre-built keys rather than a hand-written dict literal.
+_EVENT_FIELDS = tuple(EventItem.model_fields)
+
+app = FastAPI(
+    title="Vivi Planner API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,13 +63,32 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def _warmup() -> None:
+    warmup_mock_events()
+
+
+@app.on_event("shutdown")
+def _close_http_client() -> None:
+    close_http_client()
+
+
+@app.on_event("shutdown")
+def _log_llm_cache_stats() -> None:
+    # Kept out of /health so the liveness payload stays fixed and private.
+    logger.info("LLM cache stats: %s", llm_cache.stats())
+
+
 @app.get("/health")
-def healthcheck() -> dict:
+async def healthcheck() -> dict:
     return {"status": "ok", "service": "vivi-planner"}
 
 
-@app.post("/api/v1/agent/discover", response_model=AgentDiscoverResponse)
-def agent_discover_endpoint(req: AgentDiscoverRequest) -> AgentDiscoverResponse:
+@app.post(
+    "/api/v1/agent/discover",
+    responses={200: {"model": AgentDiscoverResponse}},
+)
+def agent_discover_endpoint(req: AgentDiscoverRequest) -> ORJSONResponse:
     if not req.prompt:
         raise HTTPException(status_code=400, detail="Prompt is required")
 
@@ -42,38 +100,35 @@ def agent_discover_endpoint(req: AgentDiscoverRequest) -> AgentDiscoverResponse:
         if item.get("title")
     ]
 
-    return AgentDiscoverResponse(
+    # The response is assembled from validated models, so skip FastAPI's
+    # response_model pass and hand the dump straight to orjson.
+    response = AgentDiscoverResponse.model_construct(
         summary=result.get("summary") or "",
         keywords=result.get("keywords") or [],
         activities=activities,
     )
+    return ORJSONResponse(response.model_dump())
 
 
-@app.post("/api/v1/activities", response_model=List[EventItem])
-def search_activities(req: ActivitySearchRequest) -> List[EventItem]:
+@app.post(
+    "/api/v1/activities",
+    response_model=List[EventItem],
+    response_class=ORJSONResponse,
+)
+def search_activities(req: ActivitySearchRequest) -> ORJSONResponse:
     """
     Minimal activity search. Uses Eventbrite and Google Places if API keys are configured,
     otherwise falls back to the bundled Cambridge demo data.
-    """
 
-    def _extract_terms(text: str) -> List[str]:
-        terms: List[str] = []
-        seen: set[str] = set()
-        for chunk in text.replace("•", ",").split(","):
-            for word in chunk.strip().split():
-                token = "".join(ch for ch in word.lower() if ch.isalnum())
-                if len(token) < 3:
-                    continue
-                if token not in seen:
-                    seen.add(token)
-                    terms.append(token)
-        return terms
+    Rows are already shaped like EventItem, so they are serialised straight
+    through orjson instead of being re-validated and walked by jsonable_encoder.
+    """
 
     filters: Dict[str, Any] = {
         "q": req.query_text,
         "location": req.location,
         "budget_cap": req.budget_cap,
-        "likes": _extract_terms(req.query_text),
+        "likes": list(_extract_terms(req.query_text)),
         "tags": [],
         "distance_cap": 10,
     }
@@ -82,27 +137,13 @@ def search_activities(req: ActivitySearchRequest) -> List[EventItem]:
     if not items:
         items = search_mock_events(filters)
 
-    def _mk_id(it: Dict[str, Any]) -> str:
-        base = f"{it.get('source','src')}::{it.get('title','')}::{it.get('address','')}"
-        return str(abs(hash(base)))
-
-    normalized: List[EventItem] = []
+    normalized: List[Dict[str, Any]] = []
     for it in items[:25]:
-        payload: Dict[str, Any] = {
-            "id": it.get("id") or _mk_id(it),
-            "title": it.get("title"),
-            "venue": it.get("venue"),
-            "address": it.get("address"),
-            "image_url": it.get("image_url"),
-            "lat": it.get("lat"),
-            "lng": it.get("lng"),
-            "price": it.get("price"),
-            "vibe": it.get("vibe"),
-            "summary": it.get("summary"),
-            "booking_url": it.get("booking_url"),
-            "maps_url": it.get("maps_url"),
-            "source": it.get("source") or "unknown",
-        }
-        normalized.append(EventItem(**payload))
-
-    return normalized
+        if not it.get("title"):
+            continue
+        payload: Dict[str, Any] = {field: it.get(field) for field in _EVENT_FIELDS}
+        payload["id"] = it.get("id") or _mk_id(it)
+        payload["source"] = it.get("source") or "unknown"
+        normalized.append(payload)
+
+    return ORJSONResponse(normalized)
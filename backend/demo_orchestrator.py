@@ -4,12 +4,13 @@ if __package__ is None or __package__ == "":
     import sys, pathlib
     sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
     from backend.schemas import GroupRequest
-    from backend.orchestrator import plan
+    from backend.orchestrator import plan, warmup
 else:
     from .schemas import GroupRequest
-    from .orchestrator import plan
+    from .orchestrator import plan, warmup
 
 def _run():
+    warmup()
     req = GroupRequest(
         query_text="we're bored but want something outdoorsy with live music near Cambridge after 5pm, under twenty bucks",
         user_ids=["u1","u2","u3"],
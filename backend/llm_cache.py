@@ -0,0 +1,116 @@
+"""
+In-process cache for LLM JSON responses.
+
+Controller and listener prompts repeat heavily across plan requests, and each
+miss is a full network round-trip to the model provider.  Responses are keyed
+on a hash of the system prompt plus either the exact user prompt or, for
+structured prompts, a normalised signature (see ``normalise_state``) so that
+near-identical controller states share an entry.  Concurrent misses on the
+same key are coalesced so only one request goes out to the provider.
+"""
+
+import copy
+import hashlib
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+from cachetools import TTLCache
+
+
+class LLMResponseCache:
+    def __init__(self, maxsize: int = 2048, ttl: float = 3600) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(system: str, prompt: str) -> str:
+        payload = orjson.dumps({"system": system, "prompt": prompt}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+
+    def get_or_compute(
+        self,
+        system: str,
+        prompt: str,
+        compute: Callable[[], Optional[Dict[str, Any]]],
+        wait_timeout: float = 30.0,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached value, or run ``compute`` once for all concurrent
+        callers of the same key. ``None`` results are not cached, and callers
+        that waited on a failed (or still running) compute get ``None`` back
+        instead of queueing another upstream call behind it.
+        """
+        key = self.key(system, prompt)
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self.hits += 1
+                return copy.deepcopy(value)
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = threading.Event()
+                self._inflight[key] = event
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            event.wait(wait_timeout)
+            with self._lock:
+                value = self._cache.get(key)
+            # During an outage every waiter retrying in turn would multiply
+            # the upstream timeout; let them take their fallback instead.
+            return copy.deepcopy(value) if value is not None else None
+
+        try:
+            value = compute()
+            if value is not None:
+                with self._lock:
+                    self._cache[key] = copy.deepcopy(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._cache),
+            }
+
+
+def _normalise(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(k): _normalise(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items: List[Any] = [_normalise(v) for v in value]
+        return sorted(items, key=lambda item: orjson.dumps(item, option=orjson.OPT_SORT_KEYS, default=str))
+    if isinstance(value, float):
+        return round(value, 2)
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    return value
+
+
+def normalise_state(state: Dict[str, Any]) -> str:
+    """
+    Canonical cache signature for a structured prompt.
+
+    Casing and whitespace are folded, floats rounded, and every list sorted,
+    so states that differ only in observation order or set-iteration order of
+    merged likes/tags resolve to the same entry.
+    """
+    return orjson.dumps(_normalise(state), option=orjson.OPT_SORT_KEYS, default=str).decode()
+
+
+llm_cache = LLMResponseCache()
@@ -9,7 +9,12 @@ of the pipeline receives realistic documents.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+import bisect
+import heapq
+import sys
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 # Rough price band ordering to keep the scoring logic human-readable.
 _PRICE_LEVELS = {
@@ -29,7 +34,9 @@ def _price_to_level(value: Optional[str]) -> Optional[int]:
 
 
 def _lc_words(items: Iterable[str]) -> List[str]:
-    return [item.strip().lower() for item in items if item]
+    # Interned so catalogue and query tokens from the small shared vocabulary
+    # compare and hash as the same objects.
+    return [sys.intern(item.strip().lower()) for item in items if item]
 
 
 _MOCK_EVENTS: Dict[str, List[Dict[str, Any]]] = {
@@ -190,63 +197,274 @@ _MOCK_EVENTS: Dict[str, List[Dict[str, Any]]] = {
 }
 
 
+def _build_token_bits() -> Dict[str, int]:
+    tokens: Set[str] = set()
+    for events in _MOCK_EVENTS.values():
+        for event in events:
+            vibe = (event.get("vibe") or "").lower()
+            if vibe:
+                tokens.add(vibe)
+            tokens.update(_lc_words(event.get("tags", [])))
+    return {token: bit for bit, token in enumerate(sorted(tokens))}
+
+
+# Closed vocabulary of catalogue vibes and tags.  Tag sets are scored as
+# bitmasks over it, so overlap counts are an AND plus a popcount.
+_TOKEN_BIT: Dict[str, int] = _build_token_bits()
+
+
+def _tokens_mask(tokens: Iterable[str]) -> int:
+    # Tokens outside the vocabulary cannot overlap any event and are dropped.
+    mask = 0
+    for token in tokens:
+        bit = _TOKEN_BIT.get(token)
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+
+class _PreparedEvent(NamedTuple):
+    vibe_lc: str
+    tags_lc: FrozenSet[str]
+    tag_mask: int
+    price_level: Optional[int]
+    haystack: str
+
+
+def _prepare_event(event: Dict[str, Any]) -> _PreparedEvent:
+    tags_lc = frozenset(_lc_words(event.get("tags", [])))
+    return _PreparedEvent(
+        vibe_lc=sys.intern((event.get("vibe") or "").lower()),
+        tags_lc=tags_lc,
+        tag_mask=_tokens_mask(tags_lc),
+        price_level=_price_to_level(event.get("price")),
+        haystack=f"{event.get('title', '')} {event.get('summary', '')} {event.get('address', '')}".lower(),
+    )
+
+
+# Every provider's events laid end to end, with the prepared fields held in
+# parallel lists so the search loop indexes lists instead of looking events
+# up by id.  A provider filter is just a slice of the flat layout.
+_FLAT_EVENTS: List[Dict[str, Any]] = [
+    event for events in _MOCK_EVENTS.values() for event in events
+]
+# The catalogue is constant, so the lowercased facets used by scoring are
+# derived once here rather than on every (event, query) pair.  Kept apart
+# from the event dicts so nothing private leaks into API responses.
+_FLAT_PREPARED: List[_PreparedEvent] = [_prepare_event(event) for event in _FLAT_EVENTS]
+_FLAT_VIBE_LC: List[str] = [prep.vibe_lc for prep in _FLAT_PREPARED]
+_FLAT_HAYSTACK: List[str] = [prep.haystack for prep in _FLAT_PREPARED]
+
+
+def _provider_slices() -> Dict[str, slice]:
+    slices: Dict[str, slice] = {}
+    start = 0
+    for provider, events in _MOCK_EVENTS.items():
+        slices[provider] = slice(start, start + len(events))
+        start += len(events)
+    return slices
+
+
+_BY_PROVIDER_SLICE: Dict[str, slice] = _provider_slices()
+_ALL_SLICE = slice(0, len(_FLAT_EVENTS))
+
+
+class _ProviderIndex(NamedTuple):
+    by_vibe: Dict[str, Tuple[int, ...]]
+    by_tag: Dict[str, Tuple[int, ...]]
+
+
+def _build_index(sl: slice) -> _ProviderIndex:
+    by_vibe: Dict[str, List[int]] = {}
+    by_tag: Dict[str, List[int]] = {}
+    for idx in range(sl.start, sl.stop):
+        prep = _FLAT_PREPARED[idx]
+        by_vibe.setdefault(prep.vibe_lc, []).append(idx)
+        for tag in prep.tags_lc:
+            by_tag.setdefault(tag, []).append(idx)
+    return _ProviderIndex(
+        by_vibe={k: tuple(v) for k, v in by_vibe.items()},
+        by_tag={k: tuple(v) for k, v in by_tag.items()},
+    )
+
+
+# Per-provider postings (lowercased vibe/tag -> flat positions), used to find
+# the events a query can actually score on without testing every one.
+_INDEXES: Dict[str, _ProviderIndex] = {
+    provider: _build_index(sl) for provider, sl in _BY_PROVIDER_SLICE.items()
+}
+
+
+# Upper bounds (inclusive) of the budget caps that map to price levels 0-3;
+# anything above the last edge affords level 4.
+_BUDGET_EDGES = (0, 20, 45, 75)
+
+
 def _budget_to_level(budget_cap: float) -> int:
-    if budget_cap <= 0:
+    return bisect.bisect_left(_BUDGET_EDGES, budget_cap)
+
+
+class _QueryCtx(NamedTuple):
+    vibe: str
+    likes: FrozenSet[str]
+    tags: FrozenSet[str]
+    vibe_mask: int
+    likes_mask: int
+    tags_mask: int
+    budget_level: Optional[int]
+    # Nothing in the query can move any score off zero.
+    scoreless: bool
+
+
+def _normalize_query(query: Dict[str, Any]) -> _QueryCtx:
+    """Fold the query into the loop-invariant pieces the scorer needs."""
+    budget_cap = query.get("budget_cap")
+    vibe = sys.intern((query.get("vibe") or "").strip().lower())
+    likes = frozenset(_lc_words(query.get("likes", [])))
+    tags = frozenset(_lc_words(query.get("tags", [])))
+    vibe_mask = _tokens_mask((vibe,))
+    likes_mask = _tokens_mask(likes)
+    tags_mask = _tokens_mask(tags)
+    budget_level = _budget_to_level(float(budget_cap)) if budget_cap is not None else None
+    return _QueryCtx(
+        vibe=vibe,
+        likes=likes,
+        tags=tags,
+        vibe_mask=vibe_mask,
+        likes_mask=likes_mask,
+        tags_mask=tags_mask,
+        budget_level=budget_level,
+        # Every catalogue vibe is in the vocabulary, so a zero vibe mask also
+        # rules out the exact-vibe bonus.
+        scoreless=not (vibe_mask or likes_mask or tags_mask) and budget_level is None,
+    )
+
+
+# Score weights in tenths of a point.  Only the ordering is ever used, and
+# integer scores keep the sort keys as cheap small-int compares.
+_VIBE_POINTS = 25
+_VIBE_TAG_POINTS = 15
+_LIKE_POINTS = 12
+_TAG_POINTS = 10
+_BUDGET_POINTS = 10
+
+
+def _budget_score(prep: _PreparedEvent, ctx: _QueryCtx) -> int:
+    if ctx.budget_level is None or prep.price_level is None:
         return 0
-    if budget_cap <= 20:
-        return 1
-    if budget_cap <= 45:
-        return 2
-    if budget_cap <= 75:
-        return 3
-    return 4
+    return _BUDGET_POINTS if prep.price_level <= ctx.budget_level else -_BUDGET_POINTS
+
 
+def _matching_positions(index: _ProviderIndex, ctx: _QueryCtx) -> Set[int]:
+    """Catalogue positions that share the query's vibe, a like or a tag."""
+    hits: Set[int] = set()
+    if ctx.vibe:
+        hits.update(index.by_vibe.get(ctx.vibe, ()))
+        hits.update(index.by_tag.get(ctx.vibe, ()))
+    for token in ctx.likes | ctx.tags:
+        hits.update(index.by_tag.get(token, ()))
+    return hits
 
-def _event_score(event: Dict[str, Any], query: Dict[str, Any]) -> float:
+
+def _event_score_fast(prep: _PreparedEvent, ctx: _QueryCtx) -> int:
     """Lightweight heuristic scoring to keep results in a sensible order."""
-    score = 0.0
-
-    vibe_query = (query.get("vibe") or "").strip().lower()
-    if vibe_query and event.get("vibe", "").lower() == vibe_query:
-        score += 2.5
-    elif vibe_query and vibe_query in _lc_words(event.get("tags", [])):
-        score += 1.5
-
-    likes = set(_lc_words(query.get("likes", [])))
-    tags = set(_lc_words(query.get("tags", [])))
-    if likes:
-        overlap = likes.intersection(_lc_words(event.get("tags", [])))
-        score += len(overlap) * 1.2
-    if tags:
-        overlap = tags.intersection(_lc_words(event.get("tags", [])))
-        score += len(overlap)
+    if ctx.scoreless:
+        return 0
+    score = 0
 
-    budget_cap = query.get("budget_cap")
-    if budget_cap is not None:
-        level = _price_to_level(event.get("price"))
-        if level is not None:
-            if level <= _budget_to_level(float(budget_cap)):
-                score += 1.0
-            else:
-                score -= 1.0
+    if ctx.vibe and prep.vibe_lc == ctx.vibe:
+        score += _VIBE_POINTS
+    elif prep.tag_mask & ctx.vibe_mask:
+        score += _VIBE_TAG_POINTS
+
+    if ctx.likes_mask:
+        score += (prep.tag_mask & ctx.likes_mask).bit_count() * _LIKE_POINTS
+    if ctx.tags_mask:
+        score += (prep.tag_mask & ctx.tags_mask).bit_count() * _TAG_POINTS
 
-    return score
+    return score + _budget_score(prep, ctx)
+
+
+# Below this many events per provider the pure-Python scorer is faster than
+# crossing into the compiled kernel.
+_KERNEL_MIN_EVENTS = 512
+
+
+def _load_kernel() -> Optional[Tuple[Any, Any]]:
+    """
+    Import the optional numba scorer and encode the catalogue for it.
+
+    Only called for catalogues of at least _KERNEL_MIN_EVENTS events, so the
+    numba/numpy import cost is never paid for the bundled data set.
+    """
+    if len(_TOKEN_BIT) > 64:
+        # The kernel packs each event's tag mask into a uint64.
+        return None
+    try:
+        from . import mock_events_kernel as kernel
+    except ImportError:  # pragma: no cover - depends on environment
+        return None
+    return kernel, kernel.encode_events(_FLAT_PREPARED, _TOKEN_BIT)
+
+
+_KERNEL: Optional[Tuple[Any, Any]] = (
+    _load_kernel() if len(_FLAT_EVENTS) >= _KERNEL_MIN_EVENTS else None
+)
+
+
+def _kernel_scores(sl: slice, ctx: _QueryCtx) -> Optional[List[int]]:
+    """Scores for a slice of the flat layout, or None if the kernel does not apply."""
+    if _KERNEL is None or sl.stop - sl.start < _KERNEL_MIN_EVENTS:
+        return None
+    kernel, columns = _KERNEL
+    return kernel.score(
+        columns,
+        sl,
+        _TOKEN_BIT.get(ctx.vibe, -1) if ctx.vibe else -1,
+        ctx.likes_mask,
+        ctx.tags_mask,
+        ctx.budget_level,
+    )
+
+
+def warmup() -> None:
+    """Compile the optional scoring kernel now rather than on the first search."""
+    if _KERNEL is not None:
+        _kernel_scores(_ALL_SLICE, _normalize_query({}))
 
 
 def get_tool_candidates(provider: str, query: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Return fallback events shaped like live API responses."""
+    """
+    Return fallback events shaped like live API responses.
+
+    The dicts are the shared catalogue entries, not copies; callers must
+    treat them as read-only and copy before modifying.
+    """
 
-    events = _MOCK_EVENTS.get(provider, [])
-    if not events:
+    sl = _BY_PROVIDER_SLICE.get(provider)
+    if sl is None or sl.start == sl.stop:
         return []
 
-    scored: List[Tuple[float, Dict[str, Any]]] = []
-    for event in events:
-        score = _event_score(event, query)
-        scored.append((score, event))
+    ctx = _normalize_query(query)
+    if ctx.scoreless:
+        # All scores tie at zero, and the stable top-k of a tie is catalogue order.
+        return _FLAT_EVENTS[sl][:20]
 
-    scored.sort(key=lambda item: item[0], reverse=True)
-    return [dict(event) for _, event in scored[:20]]
+    kernel_scores = _kernel_scores(sl, ctx)
+    scored: List[Tuple[int, Dict[str, Any]]]
+    if kernel_scores is not None:
+        scored = list(zip(kernel_scores, _FLAT_EVENTS[sl]))
+    else:
+        # Events outside the postings can only pick up the budget adjustment,
+        # so the full vibe/tag scoring is reserved for the ones the index returns.
+        hits = _matching_positions(_INDEXES[provider], ctx)
+        scored = []
+        for idx in range(sl.start, sl.stop):
+            prep = _FLAT_PREPARED[idx]
+            score = _event_score_fast(prep, ctx) if idx in hits else _budget_score(prep, ctx)
+            scored.append((score, _FLAT_EVENTS[idx]))
+    top = heapq.nlargest(20, scored, key=itemgetter(0))
+    return [event for _, event in top]
 
 
 def search_mock_events(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -254,42 +472,39 @@ def search_mock_events(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     Merge and lightly filter results from both mock providers.
     Expected filters keys:
       - q, location, vibe, provider, likes, tags, limit, time_window, distance_cap
+    Like get_tool_candidates, returns read-only references into the catalogue.
     """
     provider = (filters.get("provider") or "").strip().lower()
-    providers: List[str] = (
-        [provider] if provider in _MOCK_EVENTS.keys() else list(_MOCK_EVENTS.keys())
-    )
-
-    merged: List[Dict[str, Any]] = []
-    for p in providers:
-        merged.extend(get_tool_candidates(p, filters))
+    sl = _BY_PROVIDER_SLICE.get(provider, _ALL_SLICE)
 
-    # Text and facet filters
+    ctx = _normalize_query(filters)
     q = (filters.get("q") or "").strip().lower()
-    vibe = (filters.get("vibe") or "").strip().lower()
-
-    def _match(event: Dict[str, Any]) -> bool:
-        if vibe and (event.get("vibe", "") or "").lower() != vibe:
-            return False
-        if q:
-            hay = " ".join(
-                [
-                    str(event.get("title", "")),
-                    str(event.get("summary", "")),
-                    str(event.get("address", "")),
-                ]
-            ).lower()
-            if q not in hay:
-                return False
-        return True
-
-    filtered = [e for e in merged if _match(e)]
-
-    # Re-score across providers so top items rise to the top.
-    rescored: List[Tuple[float, Dict[str, Any]]] = [
-        (_event_score(e, filters), e) for e in filtered
-    ]
-    rescored.sort(key=lambda item: item[0], reverse=True)
+    vibe = ctx.vibe
 
+    positions: Iterable[int] = range(sl.start, sl.stop)
+    if vibe or q:
+        positions = (
+            idx
+            for idx in positions
+            if (not vibe or _FLAT_VIBE_LC[idx] == vibe) and (not q or q in _FLAT_HAYSTACK[idx])
+        )
     limit = int(filters.get("limit") or 25)
-    return [dict(e) for _, e in rescored[:limit]]
+
+    if ctx.scoreless:
+        # Every match scores zero, so the top ``limit`` are simply the first
+        # matches in catalogue order; stop filtering once we have them.
+        return [_FLAT_EVENTS[idx] for idx in islice(positions, max(limit, 0))]
+
+    # Filter, score once and keep the top ``limit`` in a single pass over the
+    # flat layout.  nlargest is stable, so ties keep catalogue order exactly
+    # as the previous sort-and-slice did.
+    kernel_scores = _kernel_scores(sl, ctx)
+    scored: List[Tuple[int, Dict[str, Any]]] = []
+    for idx in positions:
+        if kernel_scores is not None:
+            score = kernel_scores[idx - sl.start]
+        else:
+            score = _event_score_fast(_FLAT_PREPARED[idx], ctx)
+        scored.append((score, _FLAT_EVENTS[idx]))
+    top = heapq.nlargest(limit, scored, key=itemgetter(0))
+    return [e for _, e in top]
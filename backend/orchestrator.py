@@ -1,31 +1,73 @@
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Any, Callable, Dict, Optional
 
+from .plan_cache import PlanCache, submit_in_context
 from .schemas import GroupRequest, PlanResponse
 from .agents import ListenerAgent, PlannerAgent, WriterAgent
+from .mock_events import warmup as _warmup_mock_events
+from .tools import _PROFILE_TTL
 import os
-try:
-    from .agentic import agentic_plan
-except Exception:
-    agentic_plan = None  # type: ignore
 
-listener = ListenerAgent()
-planner  = PlannerAgent()
-writer   = WriterAgent()
+def _load_agentic() -> Optional[Callable[[GroupRequest], PlanResponse]]:
+    # Imported only when enabled: the agentic module builds its controller and
+    # caches at import, which the default pipeline never touches.
+    try:
+        from .agentic import agentic_plan as loaded
+    except Exception:
+        return None
+    return loaded
+
+# Resolved once at import; flipping USE_AGENTIC needs a restart.
+agentic_plan = _load_agentic() if os.getenv("USE_AGENTIC") == "1" else None
+_USE_AGENTIC = agentic_plan is not None
+
+# Agents are built on first use (or by warmup()), not at import.
+@cache
+def _listener() -> ListenerAgent:
+    return ListenerAgent()
+
+@cache
+def _planner() -> PlannerAgent:
+    return PlannerAgent()
+
+@cache
+def _writer() -> WriterAgent:
+    return WriterAgent()
+
+def warmup() -> None:
+    """Build the agents and compile optional kernels ahead of the first plan."""
+    _listener()
+    _planner()
+    _writer()
+    _warmup_mock_events()
+
+# Repeat queries from the demo UI are common; cache whole plans so they skip
+# the listener, taste fetches and activity search entirely.  Never outlive the
+# profile cache, or profile edits would stay hidden behind a cached plan.
+_PLAN_CACHE = PlanCache(maxsize=256, ttl=_PROFILE_TTL)
+
+# Runs the planner's taste prefetch while the listener call is in flight.
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="plan-prefetch")
 
 def plan(req: GroupRequest) -> PlanResponse:
     # Use agentic controller if enabled and available
-    if os.getenv("USE_AGENTIC") == "1" and agentic_plan is not None:
+    if _USE_AGENTIC:
         return agentic_plan(req)
 
+    return _PLAN_CACHE.get_or_build(req, _plan)
+
+def _plan(req: GroupRequest) -> PlanResponse:
     action_log = []
+    overrides: Dict[str, Any] = req.model_dump()
 
-    l_out = listener.run(req.query_text)
+    planner = _planner()
+    tastes_future = submit_in_context(_PREFETCH_POOL, planner.prefetch, req.user_ids, overrides)
+    l_out = _listener().run(req.query_text)
     action_log.append("Listener: parsed vibes/time/budget")
 
-    overrides: Dict[str, Any] = req.model_dump()
-
-    p_out = planner.run(
-        req.user_ids,
+    p_out = planner.merge(
+        tastes_future.result(),
         l_out,
         req.location_hint or "Boston, MA",
         req.time_window,
@@ -33,12 +75,12 @@ def plan(req: GroupRequest) -> PlanResponse:
     )
     action_log.append("Planner: merged tastes & fetched activities")
 
-    cards = writer.run(p_out)
+    cards = _writer().run(p_out)
     action_log.append(f"Writer: scored {len(cards)} candidates")
 
     merged_vibe = p_out["merged"].get("vibe", "chill")
     energy_profile = p_out["merged"].get("energy_level", "medium")
-    return PlanResponse(
+    return PlanResponse.model_construct(
         query_normalized=req.query_text.strip(),
         merged_vibe=merged_vibe,
         energy_profile=energy_profile,
@@ -0,0 +1,64 @@
+"""
+Whole-plan cache shared by the orchestrator and the agentic controller.
+
+A plan is only worth replaying if it was built from real upstream data.  Steps
+that quietly fall back (mock listener output while Gemini is configured,
+default tastes for a missing profile, mock venues after a Places failure)
+call ``mark_degraded`` and the plan being built is then returned but not
+stored, matching the LLM, upstream and profile caches, which never keep
+failures or misses either.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Optional
+
+from cachetools import TTLCache
+
+from .schemas import GroupRequest, PlanResponse
+
+_DEGRADED: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "plan_degraded", default=None
+)
+
+
+def mark_degraded() -> None:
+    """Flag the plan currently being built as not cacheable; no-op outside a build."""
+    flag = _DEGRADED.get()
+    if flag is not None:
+        flag.set()
+
+
+def submit_in_context(pool: Executor, fn: Callable[..., Any], *args: Any) -> Future:
+    """Submit work to a pool so that ``mark_degraded`` still reaches the caller's plan."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+class PlanCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get_or_build(
+        self, req: GroupRequest, build: Callable[[GroupRequest], PlanResponse]
+    ) -> PlanResponse:
+        key = req.cache_key()
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            # Hand out copies so callers cannot mutate the cached plan.
+            return cached.model_copy(deep=True)
+
+        degraded = threading.Event()
+        token = _DEGRADED.set(degraded)
+        try:
+            plan = build(req)
+        finally:
+            _DEGRADED.reset(token)
+
+        if degraded.is_set():
+            return plan
+        with self._lock:
+            self._cache[key] = plan
+        return plan.model_copy(deep=True)
@@ -1,5 +1,8 @@
+import hashlib
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class ActivitySearchRequest(BaseModel):
@@ -9,6 +12,8 @@ class ActivitySearchRequest(BaseModel):
 
 
 class UserTaste(BaseModel):
+    model_config = ConfigDict(revalidate_instances="never")
+
     user_id: str
     likes: List[str] = []
     dislikes: List[str] = []
@@ -29,6 +34,23 @@ class GroupRequest(BaseModel):
     custom_likes: List[str] = Field(default_factory=list)
     custom_tags: List[str] = Field(default_factory=list)
 
+    def cache_key(self) -> bytes:
+        """Order-insensitive digest of every field that shapes the plan."""
+        canonical = {
+            "user_ids": sorted(self.user_ids),
+            # query_normalized and PlanCard.time echo these verbatim, so they
+            # are only stripped, never case-folded.
+            "query": self.query_text.strip(),
+            "location": (self.location_hint or "").strip().lower(),
+            "time_window": (self.time_window or "").strip(),
+            "vibe_hint": self.vibe_hint,
+            "budget_cap": self.budget_cap,
+            "distance_km": self.distance_km,
+            "custom_likes": sorted(self.custom_likes),
+            "custom_tags": sorted(self.custom_tags),
+        }
+        return hashlib.blake2b(orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS)).digest()
+
 
 class FriendOverride(BaseModel):
     user_id: str
@@ -57,6 +79,8 @@ class EventItem(BaseModel):
 
 
 class PlanCard(BaseModel):
+    model_config = ConfigDict(revalidate_instances="never")
+
     title: str
     subtitle: Optional[str] = None
     time: Optional[str] = None
@@ -76,6 +100,8 @@ class PlanCard(BaseModel):
 
 
 class PlanResponse(BaseModel):
+    model_config = ConfigDict(revalidate_instances="never")
+
     query_normalized: str
     merged_vibe: Optional[str] = None
     energy_profile: Optional[str] = None
@@ -83,6 +109,24 @@ class PlanResponse(BaseModel):
     action_log: List[str]
 
 
+class ControllerDecision(BaseModel):
+    action: Optional[str] = None
+    args: Dict[str, Any] = Field(default_factory=dict)
+    rationale: str = ""
+
+    # The controller LLM routinely emits nulls, empty lists or empty strings
+    # for unused fields; none of them should discard an otherwise valid action.
+    @field_validator("args", mode="before")
+    @classmethod
+    def _falsy_args_as_empty(cls, value: Any) -> Any:
+        return value or {}
+
+    @field_validator("rationale", mode="before")
+    @classmethod
+    def _rationale_as_text(cls, value: Any) -> str:
+        return "" if value is None else str(value)
+
+
 class AgentDiscoverRequest(BaseModel):
     prompt: str
     location: Optional[str] = None
@@ -4,20 +4,105 @@
 import os
 import re
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
-from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from functools import lru_cache, wraps
+from itertools import chain
 from urllib.parse import quote_plus
 
 import httpx
+from cachetools import TTLCache
 from supabase import Client  # type: ignore
 
 from backend.schemas import UserTaste, FriendOverride
 from backend.supabase_client import safe_get_supabase_client
 from backend.mock_events import get_tool_candidates
+from backend.plan_cache import mark_degraded, submit_in_context
 
 logger = logging.getLogger(__name__)
 
+# One pooled client for every upstream call so keep-alive connections and
+# TLS sessions are reused across requests instead of re-handshaking each time.
+# Created on first use and again after close_http_client(), so an app shutdown
+# (e.g. one TestClient lifespan) never leaves later callers a closed client.
+_HTTP: Optional[httpx.Client] = None
+_HTTP_LOCK = threading.Lock()
+
+
+def _http() -> httpx.Client:
+    global _HTTP
+    client = _HTTP
+    if client is None or client.is_closed:
+        with _HTTP_LOCK:
+            if _HTTP is None or _HTTP.is_closed:
+                _HTTP = httpx.Client(timeout=10.0)
+            client = _HTTP
+    return client
+
+
+def close_http_client() -> None:
+    global _HTTP
+    with _HTTP_LOCK:
+        if _HTTP is not None:
+            _HTTP.close()
+            _HTTP = None
+
+
+# Short-lived cache of upstream search results. UI filter toggles replay the
+# same query within seconds, so a minute of reuse removes most outbound calls.
+_UPSTREAM_CACHE: TTLCache = TTLCache(maxsize=512, ttl=60)
+_UPSTREAM_CACHE_LOCK = threading.Lock()
+
+_Fetcher = Callable[[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+def _upstream_cache_key(source: str, query: Dict[str, Any]) -> Tuple[Any, ...]:
+    def _strip(value: Any) -> Optional[str]:
+        return str(value).strip() if value is not None else None
+
+    def _norm(value: Any) -> Optional[str]:
+        stripped = _strip(value)
+        return stripped.lower() if stripped is not None else None
+
+    return (
+        source,
+        _norm(query.get("location")),
+        # Fetchers echo vibe into their results, so its case must stay in the key.
+        _strip(query.get("vibe")),
+        _norm(query.get("time_window")),
+        query.get("distance_cap"),
+        query.get("budget_cap"),
+        tuple(_norm(item) for item in query.get("likes") or []),
+        tuple(_norm(item) for item in query.get("tags") or []),
+    )
+
+
+def _cache_upstream(source: str) -> Callable[[_Fetcher], _Fetcher]:
+    """Memoise a provider fetch on its normalised query; empty results are not stored."""
+
+    def decorator(fetch: _Fetcher) -> _Fetcher:
+        @wraps(fetch)
+        def wrapper(query: Dict[str, Any]) -> List[Dict[str, Any]]:
+            key = _upstream_cache_key(source, query)
+            with _UPSTREAM_CACHE_LOCK:
+                cached = _UPSTREAM_CACHE.get(key)
+            if cached is not None:
+                return list(cached)
+
+            results = fetch(query)
+            if results:
+                with _UPSTREAM_CACHE_LOCK:
+                    _UPSTREAM_CACHE[key] = results
+            return list(results)
+
+        return wrapper
+
+    return decorator
+
+
 RECREATION_KEYWORDS = [
     "arcade",
     "amusement park",
@@ -53,8 +138,29 @@ RECREATION_KEYWORDS = [
     "arcade bar",
 ]
 
+# Profile rows barely change within a session and the planner, controller
+# and discover flows all re-read them, so keep found rows for a few minutes.
+# Misses and failures are not stored so they are retried on the next call.
+_PROFILE_TTL = 300
+_PROFILE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=_PROFILE_TTL)
+_PROFILE_CACHE_LOCK = threading.Lock()
+
+
 # === Data-access contracts Friend 2 will implement for real ===
 def _fetch_profile_from_supabase(user_id: str) -> Optional[Dict[str, Any]]:
+    with _PROFILE_CACHE_LOCK:
+        cached = _PROFILE_CACHE.get(user_id)
+    if cached is not None:
+        return cached
+
+    record = _query_profile(user_id)
+    if record:
+        with _PROFILE_CACHE_LOCK:
+            _PROFILE_CACHE[user_id] = record
+    return record
+
+
+def _query_profile(user_id: str) -> Optional[Dict[str, Any]]:
     client: Optional[Client] = safe_get_supabase_client()
     if client is None:
         logger.error("Supabase client unavailable when fetching user %s", user_id)
@@ -78,20 +184,17 @@ def _fetch_profile_from_supabase(user_id: str) -> Optional[Dict[str, Any]]:
 
 def tool_get_user_taste(user_id: str, overrides: Optional[Dict[str, FriendOverride]] = None) -> UserTaste:
     if overrides and user_id in overrides:
-        override = overrides[user_id]
-        return UserTaste(
-            user_id=override.user_id,
-            likes=list(override.likes),
-            vibes=list(override.vibes),
-            tags=list(override.tags),
-            budget_max=override.budget_max,
-            distance_km_max=override.distance_km_max,
+        # FriendOverride is already validated and model_dump hands back fresh
+        # lists, so the taste can be built without copies or revalidation.
+        return UserTaste.model_construct(
+            **overrides[user_id].model_dump(exclude={"display_name"})
         )
 
     record = _fetch_profile_from_supabase(user_id)
 
     if not record:
         logger.warning("No profile found for user %s; returning default preferences.", user_id)
+        mark_degraded()
         return UserTaste(user_id=user_id)
 
     likes = record.get("likes") or []
@@ -114,11 +217,28 @@ def tool_get_user_taste(user_id: str, overrides: Optional[Dict[str, FriendOverri
         distance_km_max=record.get("distance_km_max"),
     )
 
+# Supabase profile reads are blocking I/O; fan them out so a group's tastes
+# arrive in roughly one round-trip instead of one per member.
+_TASTE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="taste-fetch")
+
+
+def tool_get_user_tastes(
+    user_ids: List[str], overrides: Optional[Dict[str, FriendOverride]] = None
+) -> List[UserTaste]:
+    # A user listed twice is still one person: fetch and weight them once.
+    unique_ids = list(dict.fromkeys(user_ids))
+    if len(unique_ids) <= 1:
+        return [tool_get_user_taste(uid, overrides=overrides) for uid in unique_ids]
+    futures = [
+        submit_in_context(_TASTE_POOL, tool_get_user_taste, uid, overrides)
+        for uid in unique_ids
+    ]
+    return [future.result() for future in futures]
+
+
 def tool_merge_tastes(tastes: List[UserTaste]) -> Dict[str, Any]:
     # naive weighted union for hackathon speed
-    from collections import Counter
-
-    vibes = Counter(v for t in tastes for v in t.vibes).most_common()
+    vibes = Counter(chain.from_iterable(t.vibes for t in tastes)).most_common()
     merged_vibe = (vibes[0][0] if vibes else "chill")
 
     budgets = [t.budget_max for t in tastes if t.budget_max is not None]
@@ -127,8 +247,8 @@ def tool_merge_tastes(tastes: List[UserTaste]) -> Dict[str, Any]:
     distance_values = [t.distance_km_max for t in tastes if t.distance_km_max is not None]
     distance = min(distance_values) if distance_values else 5
 
-    likes = list({l for t in tastes for l in t.likes})
-    tags = list({tg for t in tastes for tg in t.tags})
+    likes = list(set(chain.from_iterable(t.likes for t in tastes)))
+    tags = list(set(chain.from_iterable(t.tags for t in tastes)))
     return {
         "merged_vibe": merged_vibe,
         "budget_cap": budget,
@@ -171,8 +291,30 @@ def _price_band_to_level(price: Optional[str]) -> Optional[int]:
     return normalized.count("$")
 
 
+@lru_cache(maxsize=256)
+def _geocode_cached(location: str, api_key: str) -> Optional[Tuple[float, float]]:
+    """
+    Coordinates for a location never change between requests, so resolve each
+    one once per process. Transport errors and quota statuses raise instead of
+    returning so they are never memoised.
+    """
+    resp = _http().get(
+        "https://maps.googleapis.com/maps/api/geocode/json",
+        params={"address": location, "key": api_key},
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    if data.get("results"):
+        geometry = data["results"][0]["geometry"]["location"]
+        return geometry["lat"], geometry["lng"]
+    status = data.get("status")
+    if status not in {"OK", "ZERO_RESULTS"}:
+        raise RuntimeError(f"geocode returned status {status}")
+    return None
+
+
 def _geocode_location(location: Optional[str]) -> Optional[Tuple[float, float]]:
-    if not location:
+    if not location or not location.strip():
         return None
 
     api_key = os.getenv("GOOGLE_PLACES_API_KEY") or os.getenv("GOOGLE_MAPS_API_KEY")
@@ -180,24 +322,11 @@ def _geocode_location(location: Optional[str]) -> Optional[Tuple[float, float]]:
         return None
 
     try:
-        resp = httpx.get(
-            "https://maps.googleapis.com/maps/api/geocode/json",
-            params={"address": location, "key": api_key},
-            timeout=10.0,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        if data.get("results"):
-            geometry = data["results"][0]["geometry"]["location"]
-            return geometry["lat"], geometry["lng"]
-        if data.get("status") != "OK":
-            logger.warning("Geocode lookup returned status %s", data.get("status"))
+        return _geocode_cached(location.strip(), api_key)
     except Exception as exc:
         logger.error("Geocode lookup failed: %s", exc)
         return None
 
-    return None
-
 
 def _parse_time_window(time_window: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
     if not time_window:
@@ -254,6 +383,7 @@ def _parse_time_window(time_window: Optional[str]) -> Tuple[Optional[str], Optio
     return start_iso, end_iso
 
 
+@_cache_upstream("google_places")
 def _fetch_google_places(query: Dict[str, Any]) -> List[Dict[str, Any]]:
     api_key = os.getenv("GOOGLE_PLACES_API_KEY")
     if not api_key:
@@ -275,37 +405,36 @@ def _fetch_google_places(query: Dict[str, Any]) -> List[Dict[str, Any]]:
 
     results: List[Dict[str, Any]] = []
     try:
-        with httpx.Client(timeout=10.0) as client:
-            if coords:
-                params = {
-                    "location": f"{coords[0]},{coords[1]}",
+        if coords:
+            params = {
+                "location": f"{coords[0]},{coords[1]}",
+                "radius": radius_m,
+                "keyword": keyword,
+                "key": api_key,
+                "language": "en",
+            }
+            if query.get("time_window"):
+                params["opennow"] = "true"
+            resp = _http().get(
+                "https://maps.googleapis.com/maps/api/place/nearbysearch/json",
+                params=params,
+            )
+        else:
+            resp = _http().get(
+                "https://maps.googleapis.com/maps/api/place/textsearch/json",
+                params={
+                    "query": f"{keyword} {query.get('location') or ''}".strip(),
                     "radius": radius_m,
-                    "keyword": keyword,
                     "key": api_key,
                     "language": "en",
-                }
-                if query.get("time_window"):
-                    params["opennow"] = "true"
-                resp = client.get(
-                    "https://maps.googleapis.com/maps/api/place/nearbysearch/json",
-                    params=params,
-                )
-            else:
-                resp = client.get(
-                    "https://maps.googleapis.com/maps/api/place/textsearch/json",
-                    params={
-                        "query": f"{keyword} {query.get('location') or ''}".strip(),
-                        "radius": radius_m,
-                        "key": api_key,
-                        "language": "en",
-                        "region": "us",
-                    },
-                )
-            resp.raise_for_status()
-            data = resp.json()
-            status = data.get("status")
-            if status not in {"OK", "ZERO_RESULTS"}:
-                logger.warning("Google Places returned status %s: %s", status, data.get("error_message"))
+                    "region": "us",
+                },
+            )
+        resp.raise_for_status()
+        data = resp.json()
+        status = data.get("status")
+        if status not in {"OK", "ZERO_RESULTS"}:
+            logger.warning("Google Places returned status %s: %s", status, data.get("error_message"))
     except Exception as exc:
         logger.error("Google Places fetch failed: %s", exc)
         return []
@@ -370,6 +499,7 @@ def _fetch_google_places(query: Dict[str, Any]) -> List[Dict[str, Any]]:
     return results
 
 
+@_cache_upstream("eventbrite")
 def _fetch_eventbrite_events(query: Dict[str, Any]) -> List[Dict[str, Any]]:
     token = os.getenv("EVENTBRITE_API_KEY")
     if not token:
@@ -437,11 +567,10 @@ def _fetch_eventbrite_events(query: Dict[str, Any]) -> List[Dict[str, Any]]:
 
     def _query_eventbrite(search_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
-            resp = httpx.get(
+            resp = _http().get(
                 "https://www.eventbriteapi.com/v3/events/search/",
                 params=search_params,
                 headers={"Authorization": f"Bearer {token}"},
-                timeout=10.0,
             )
             resp.raise_for_status()
             data = resp.json()
@@ -508,19 +637,18 @@ def tool_find_activities(query: Dict[str, Any]) -> List[Dict[str, Any]]:
     except Exception as exc:  # pragma: no cover - defensive
         logger.error("Google Places lookup failed: %s", exc)
     # fall back to mock catalogue
+    mark_degraded()
     return get_tool_candidates("google_places", query)
 
 # === Inspired extensions (stubs for agentic flow) ===
 
-@lru_cache(maxsize=512)
 def tool_get_user_taste_cached(user_id: str, overrides: Optional[Dict[str, FriendOverride]] = None) -> UserTaste:
     """
-    Lightweight in-process cache for user tastes.
-    Replace with Supabase row fetch + HTTP cache headers.
+    Cached taste lookup. Profile rows are held in the TTL cache behind
+    _fetch_profile_from_supabase, so every call builds a fresh UserTaste and
+    callers can never mutate a shared cached instance.
     """
-    if overrides:
-        return tool_get_user_taste(user_id, overrides=overrides)
-    return tool_get_user_taste(user_id)
+    return tool_get_user_taste(user_id, overrides=overrides)
 
 
 def tool_search_places_grid(query: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -528,12 +656,16 @@ def tool_search_places_grid(query: Dict[str, Any]) -> List[Dict[str, Any]]:
     Grid-style expansion for dense urban discovery.
     For demo: call the same finder, but tag results to indicate grid search.
     """
-    base = tool_find_activities(query)
-    for r in base:
-        r.setdefault("tags", [])
-        if "grid" not in r["tags"]:
-            r["tags"].append("grid")
-    return base
+    grid: List[Dict[str, Any]] = []
+    for r in tool_find_activities(query):
+        # Copy before tagging: results may be shared with the upstream cache.
+        item = dict(r)
+        tags = list(item.get("tags") or [])
+        if "grid" not in tags:
+            tags.append("grid")
+        item["tags"] = tags
+        grid.append(item)
+    return grid
 
 
 def tool_sentiment_enrich(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]: